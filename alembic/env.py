@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from logging.config import fileConfig
 
 from alembic import context
@@ -13,25 +14,16 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 
-def _normalize_database_url(url: str) -> str:
-    # SQLAlchemy defaults Postgres to psycopg2 when no driver is specified.
-    # This project uses psycopg v3 (installed via `psycopg[binary]`).
-    if url.startswith("postgres://"):
-        return url.replace("postgres://", "postgresql+psycopg://", 1)
-    if url.startswith("postgresql://") and "+psycopg" not in url.split("://", 1)[0]:
-        return url.replace("postgresql://", "postgresql+psycopg://", 1)
-    return url
-
-
+@lru_cache
 def get_database_url() -> str:
     url = os.getenv("DATABASE_URL")
     if not url:
         raise RuntimeError("DATABASE_URL is not set (required for Alembic migrations).")
-    return _normalize_database_url(url)
+    return normalize_database_url(url)
 
 
 # Import your SQLAlchemy Base + models for autogenerate support
-from app.db import Base  # noqa: E402
+from app.db import Base, normalize_database_url  # noqa: E402
 from app import models_db  # noqa: F401,E402
 
 target_metadata = Base.metadata
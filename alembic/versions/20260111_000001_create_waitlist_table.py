@@ -37,9 +37,6 @@ def upgrade() -> None:
             ),
         )
 
-    # Helpful index for lookups / admin export.
-    op.execute(sa.text("CREATE INDEX IF NOT EXISTS ix_waitlist_email ON waitlist (email)"))
-
     # Enforce case-insensitive uniqueness at the DB layer.
     # This prevents duplicates like Test@Email.com vs test@email.com under concurrency.
     op.execute(
@@ -51,6 +48,5 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     op.drop_index("uq_waitlist_email_lower", table_name="waitlist")
-    op.drop_index("ix_waitlist_email", table_name="waitlist")
     op.drop_table("waitlist")
 
@@ -23,15 +23,17 @@ def upgrade() -> None:
     op.add_column("waitlist", sa.Column("last_name", sa.String(50), nullable=True))
     op.add_column("waitlist", sa.Column("phone", sa.String(20), nullable=True))
     
-    # Set default values for any existing rows
+    # Set default values for any existing rows (single pass over the table).
+    # Placeholder phones are derived from the row id so they don't collide
+    # with each other when uq_waitlist_phone is built below.
     op.execute(
-        sa.text("UPDATE waitlist SET first_name = 'Unknown' WHERE first_name IS NULL")
-    )
-    op.execute(
-        sa.text("UPDATE waitlist SET last_name = 'Unknown' WHERE last_name IS NULL")
-    )
-    op.execute(
-        sa.text("UPDATE waitlist SET phone = '+2340000000000' WHERE phone IS NULL")
+        sa.text(
+            "UPDATE waitlist SET "
+            "first_name = COALESCE(first_name, 'Unknown'), "
+            "last_name = COALESCE(last_name, 'Unknown'), "
+            "phone = COALESCE(phone, '+234' || lpad(id::text, 10, '0')) "
+            "WHERE first_name IS NULL OR last_name IS NULL OR phone IS NULL"
+        )
     )
     
     # Now make columns non-nullable
@@ -39,30 +41,23 @@ def upgrade() -> None:
     op.alter_column("waitlist", "last_name", nullable=False)
     op.alter_column("waitlist", "phone", nullable=False)
     
-    # Add unique constraint on phone
-    op.execute(
-        sa.text(
-            "CREATE UNIQUE INDEX IF NOT EXISTS uq_waitlist_phone ON waitlist (phone)"
-        )
-    )
-    
-    # Add unique constraint on email (not just case-insensitive index)
-    op.execute(
-        sa.text(
-            "CREATE UNIQUE INDEX IF NOT EXISTS uq_waitlist_email ON waitlist (email)"
+    # Build indexes without blocking writes to a live waitlist.
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        # Add unique constraint on phone
+        op.execute(
+            sa.text(
+                "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_waitlist_phone "
+                "ON waitlist (phone)"
+            )
         )
-    )
-    
-    # Index for phone lookups
-    op.execute(
-        sa.text("CREATE INDEX IF NOT EXISTS ix_waitlist_phone ON waitlist (phone)")
-    )
+
+        # Email uniqueness is already enforced by uq_waitlist_email_lower, and
+        # uq_waitlist_phone serves phone lookups, so no plain indexes are needed
 
 
 def downgrade() -> None:
-    op.drop_index("ix_waitlist_phone", table_name="waitlist")
     op.drop_index("uq_waitlist_phone", table_name="waitlist")
-    op.drop_index("uq_waitlist_email", table_name="waitlist")
     op.drop_column("waitlist", "phone")
     op.drop_column("waitlist", "last_name")
     op.drop_column("waitlist", "first_name")
@@ -18,74 +18,57 @@ depends_on = None
 
 
 def upgrade() -> None:
-    bind = op.get_bind()
-    inspector = sa.inspect(bind)
-
-    # Create table if it doesn't exist
-    if not inspector.has_table("contact_messages"):
-        op.create_table(
-            "contact_messages",
-            sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
-            sa.Column("name", sa.String(length=100), nullable=False),
-            sa.Column("email", sa.String(length=320), nullable=False),
-            sa.Column("subject", sa.String(length=200), nullable=False),
-            sa.Column("message", sa.Text(), nullable=False),
-            sa.Column("ip_address", sa.String(length=45), nullable=True),
-            sa.Column("user_agent", sa.String(length=500), nullable=True),
-            sa.Column("is_spam", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-            sa.Column("is_read", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-            sa.Column(
-                "created_at",
-                sa.DateTime(timezone=True),
-                server_default=sa.text("now()"),
-                nullable=False,
-            ),
-        )
-
-    # Index for rate limiting by IP
-    op.execute(
-        sa.text(
-            "CREATE INDEX IF NOT EXISTS ix_contact_messages_ip_address "
-            "ON contact_messages (ip_address)"
-        )
-    )
-    
-    # Index for rate limiting by email
+    # Idempotent without a catalog probe first (one round trip instead of two)
     op.execute(
         sa.text(
-            "CREATE INDEX IF NOT EXISTS ix_contact_messages_email "
-            "ON contact_messages (email)"
+            """
+            CREATE TABLE IF NOT EXISTS contact_messages (
+                id SERIAL PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                email VARCHAR(320) NOT NULL,
+                subject VARCHAR(200) NOT NULL,
+                message TEXT NOT NULL,
+                ip_address VARCHAR(45),
+                user_agent VARCHAR(500),
+                is_spam BOOLEAN NOT NULL DEFAULT false,
+                is_read BOOLEAN NOT NULL DEFAULT false,
+                created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+            )
+            """
         )
     )
-    
-    # Index for filtering by timestamp (used in rate limit queries)
-    op.execute(
-        sa.text(
-            "CREATE INDEX IF NOT EXISTS ix_contact_messages_created_at "
-            "ON contact_messages (created_at)"
+
+    # Build indexes without blocking writes (CONCURRENTLY must run outside a transaction).
+    # Each statement is sent on its own: a multi-statement string runs as one implicit
+    # transaction, which CREATE INDEX CONCURRENTLY refuses.
+    with op.get_context().autocommit_block():
+        # Index for filtering by timestamp (used in rate limit queries)
+        op.execute(
+            sa.text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_created_at "
+                "ON contact_messages (created_at)"
+            )
         )
-    )
-    
-    # Composite index for efficient rate limit queries
-    op.execute(
-        sa.text(
-            "CREATE INDEX IF NOT EXISTS ix_contact_messages_ip_created "
-            "ON contact_messages (ip_address, created_at)"
+
+        # Composite indexes for efficient rate limit queries. These also serve
+        # plain ip_address / lower(email) lookups, so no single-column indexes.
+        op.execute(
+            sa.text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_ip_created "
+                "ON contact_messages (ip_address, created_at)"
+            )
         )
-    )
-    
-    op.execute(
-        sa.text(
-            "CREATE INDEX IF NOT EXISTS ix_contact_messages_email_created "
-            "ON contact_messages (lower(email), created_at)"
+
+        op.execute(
+            sa.text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_email_created "
+                "ON contact_messages (lower(email), created_at)"
+            )
         )
-    )
 
 
 def downgrade() -> None:
     op.drop_index("ix_contact_messages_email_created", table_name="contact_messages")
     op.drop_index("ix_contact_messages_ip_created", table_name="contact_messages")
     op.drop_index("ix_contact_messages_created_at", table_name="contact_messages")
-    op.drop_index("ix_contact_messages_email", table_name="contact_messages")
-    op.drop_index("ix_contact_messages_ip_address", table_name="contact_messages")
     op.drop_table("contact_messages")
@@ -0,0 +1,42 @@
+"""Drop single-column contact_messages indexes covered by composites.
+
+Revision ID: 20261015_000001
+Revises: 20260128_000001
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_000001"
+down_revision = "20260128_000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ix_contact_messages_ip_created (ip_address, created_at) and
+    # ix_contact_messages_email_created (lower(email), created_at) already serve
+    # every lookup these did; dropping them saves index writes on each INSERT.
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_ip_address"))
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_email"))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_ip_address "
+                "ON contact_messages (ip_address)"
+            )
+        )
+        op.execute(
+            sa.text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_email "
+                "ON contact_messages (email)"
+            )
+        )
@@ -0,0 +1,31 @@
+"""Drop the redundant plain ix_waitlist_email index.
+
+Revision ID: 20261015_000002
+Revises: 20261015_000001
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_000002"
+down_revision = "20261015_000001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Email lookups are answered by the unique index; this one only adds write
+    # cost on every signup. 20261015_000004 settles which unique index stays.
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_waitlist_email"))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_waitlist_email ON waitlist (email)")
+        )
@@ -0,0 +1,67 @@
+"""Right-size column types: BIGINT ids, INET ip_address, TEXT user_agent.
+
+Revision ID: 20261015_000003
+Revises: 20261015_000002
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_000003"
+down_revision = "20261015_000002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 64-bit ids so a busy waitlist can never exhaust the 32-bit serial range.
+    # The owned sequences are still typed integer and need widening too.
+    op.execute(sa.text("ALTER TABLE waitlist ALTER COLUMN id TYPE BIGINT"))
+    op.execute(sa.text("ALTER SEQUENCE waitlist_id_seq AS BIGINT"))
+    op.execute(sa.text("ALTER TABLE contact_messages ALTER COLUMN id TYPE BIGINT"))
+    op.execute(sa.text("ALTER SEQUENCE contact_messages_id_seq AS BIGINT"))
+
+    # INET stores an address in at most 19 bytes instead of up to 46 of text.
+    # Older rows may hold arbitrary header values; those become NULL.
+    op.execute(
+        sa.text(
+            """
+            CREATE FUNCTION pg_temp.try_inet(value text) RETURNS inet AS $$
+            BEGIN
+                RETURN value::inet;
+            EXCEPTION WHEN others THEN
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            "ALTER TABLE contact_messages ALTER COLUMN ip_address TYPE INET "
+            "USING pg_temp.try_inet(ip_address)"
+        )
+    )
+
+    # VARCHAR(n) stores the same as TEXT in Postgres; length is capped in the service.
+    op.execute(sa.text("ALTER TABLE contact_messages ALTER COLUMN user_agent TYPE TEXT"))
+
+
+def downgrade() -> None:
+    op.execute(
+        sa.text("ALTER TABLE contact_messages ALTER COLUMN user_agent TYPE VARCHAR(500)")
+    )
+    op.execute(
+        sa.text(
+            "ALTER TABLE contact_messages ALTER COLUMN ip_address TYPE VARCHAR(45) "
+            "USING host(ip_address)"
+        )
+    )
+    op.execute(sa.text("ALTER SEQUENCE contact_messages_id_seq AS INTEGER"))
+    op.execute(sa.text("ALTER TABLE contact_messages ALTER COLUMN id TYPE INTEGER"))
+    op.execute(sa.text("ALTER SEQUENCE waitlist_id_seq AS INTEGER"))
+    op.execute(sa.text("ALTER TABLE waitlist ALTER COLUMN id TYPE INTEGER"))
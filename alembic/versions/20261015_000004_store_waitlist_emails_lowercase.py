@@ -0,0 +1,54 @@
+"""Store waitlist emails lowercased and enforce uniqueness on the plain column.
+
+Revision ID: 20261015_000004
+Revises: 20261015_000003
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_000004"
+down_revision = "20261015_000003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cannot collide: uq_waitlist_email_lower already guarantees lower(email) is unique
+    op.execute(sa.text("UPDATE waitlist SET email = lower(email) WHERE email <> lower(email)"))
+
+    # Guarantees the plain unique index below is case-insensitive in practice.
+    # Added NOT VALID and validated after the commit, so the table scan runs
+    # under SHARE UPDATE EXCLUSIVE instead of the ALTER's exclusive lock.
+    op.execute(
+        sa.text(
+            "ALTER TABLE waitlist ADD CONSTRAINT ck_waitlist_email_lowercase "
+            "CHECK (email = lower(email)) NOT VALID"
+        )
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("ALTER TABLE waitlist VALIDATE CONSTRAINT ck_waitlist_email_lowercase"))
+        op.execute(
+            sa.text(
+                "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_waitlist_email "
+                "ON waitlist (email)"
+            )
+        )
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS uq_waitlist_email_lower"))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_waitlist_email_lower "
+                "ON waitlist (lower(email))"
+            )
+        )
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS uq_waitlist_email"))
+    op.drop_constraint("ck_waitlist_email_lowercase", "waitlist", type_="check")
@@ -0,0 +1,74 @@
+"""Store contact emails lowercased and index the plain column for rate limiting.
+
+Revision ID: 20261015_000005
+Revises: 20261015_000004
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_000005"
+down_revision = "20261015_000004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The service has always lowercased before insert; this only catches stragglers
+    op.execute(
+        sa.text("UPDATE contact_messages SET email = lower(email) WHERE email <> lower(email)")
+    )
+
+    # Added NOT VALID and validated after the commit, so the table scan runs
+    # under SHARE UPDATE EXCLUSIVE instead of the ALTER's exclusive lock
+    op.execute(
+        sa.text(
+            "ALTER TABLE contact_messages ADD CONSTRAINT ck_contact_messages_email_lowercase "
+            "CHECK (email = lower(email)) NOT VALID"
+        )
+    )
+
+    # Swap the lower(email) expression index for one on the plain column, which
+    # the rate-limit check can now use (and answer with an index-only scan)
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                "ALTER TABLE contact_messages "
+                "VALIDATE CONSTRAINT ck_contact_messages_email_lowercase"
+            )
+        )
+        op.execute(
+            sa.text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_email_created_plain "
+                "ON contact_messages (email, created_at)"
+            )
+        )
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_email_created"))
+    op.execute(
+        sa.text(
+            "ALTER INDEX ix_contact_messages_email_created_plain "
+            "RENAME TO ix_contact_messages_email_created"
+        )
+    )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_email_created_lower "
+                "ON contact_messages (lower(email), created_at)"
+            )
+        )
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_email_created"))
+    op.execute(
+        sa.text(
+            "ALTER INDEX ix_contact_messages_email_created_lower "
+            "RENAME TO ix_contact_messages_email_created"
+        )
+    )
+    op.drop_constraint("ck_contact_messages_email_lowercase", "contact_messages", type_="check")
@@ -0,0 +1,51 @@
+"""Add contact_messages.updated_at for admin-list ETags.
+
+Revision ID: 20261015_000006
+Revises: 20261015_000005
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_000006"
+down_revision = "20261015_000005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # now() is stable, so Postgres 11+ adds the column without rewriting the table
+    op.add_column(
+        "contact_messages",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    # Later writes get the wall-clock time, not the transaction start, so a
+    # slow transaction cannot commit an updated_at below an already-served MAX.
+    # Setting it after the ADD keeps the backfill above rewrite-free.
+    op.alter_column(
+        "contact_messages", "updated_at", server_default=sa.text("clock_timestamp()")
+    )
+
+    # Lets MAX(updated_at) read one index entry instead of scanning the table
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contact_messages_updated_at "
+                "ON contact_messages (updated_at)"
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_contact_messages_updated_at"))
+    op.drop_column("contact_messages", "updated_at")
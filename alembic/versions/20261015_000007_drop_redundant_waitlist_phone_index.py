@@ -0,0 +1,31 @@
+"""Drop ix_waitlist_phone; uq_waitlist_phone already indexes waitlist.phone.
+
+Revision ID: 20261015_000007
+Revises: 20261015_000006
+Create Date: 2026-10-15
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_000007"
+down_revision = "20261015_000006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The unique index enforces uniqueness and serves lookups; the plain one
+    # only adds write cost on every signup
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_waitlist_phone"))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            sa.text("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_waitlist_phone ON waitlist (phone)")
+        )
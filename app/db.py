@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import os
+import re
 from functools import lru_cache
-from typing import Generator
+from typing import AsyncGenerator
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
+
+
+# Bare Postgres schemes only; URLs that already name a driver are left alone
+_BARE_SCHEME_RE = re.compile(r"^postgres(?:ql)?://")
 
 
 def normalize_database_url(url: str) -> str:
@@ -15,17 +20,13 @@ def normalize_database_url(url: str) -> str:
 
     - postgres://...      -> postgresql+psycopg://...
     - postgresql://...    -> postgresql+psycopg://...
-    
-    Also ensures sslmode=require for Neon compatibility.
+
+    Shared with alembic/env.py.
     """
-    if url.startswith("postgres://"):
-        url = url.replace("postgres://", "postgresql+psycopg://", 1)
-    elif url.startswith("postgresql://") and "+psycopg" not in url.split("://", 1)[0]:
-        url = url.replace("postgresql://", "postgresql+psycopg://", 1)
-    
-    return url
+    return _BARE_SCHEME_RE.sub("postgresql+psycopg://", url, count=1)
 
 
+@lru_cache
 def get_database_url() -> str:
     url = os.getenv("DATABASE_URL")
     if not url:
@@ -34,34 +35,63 @@ def get_database_url() -> str:
 
 
 @lru_cache
-def get_engine() -> Engine:
+def get_engine() -> AsyncEngine:
     """
-    Create SQLAlchemy engine optimized for serverless (Vercel + Neon).
-    
-    - pool_pre_ping: Verify connections before use (handles serverless cold starts)
-    - pool_size=5: Small pool for serverless
+    Create async SQLAlchemy engine optimized for serverless (Vercel + Neon).
+
+    psycopg v3 is natively async, so the same postgresql+psycopg:// URL drives
+    an async engine; requests await the database instead of parking a threadpool
+    worker for the duration of each query.
+
+    On Vercel (VERCEL env var is set) each invocation runs in its own short-lived
+    process, so a connection pool can never be reused and only holds sockets Neon
+    will eventually kill. Use NullPool there: one connection per checkout, closed
+    on release.
+
+    Elsewhere (Docker / Render / local) keep a small pool:
+    - pool_size=5: Small pool
     - max_overflow=10: Allow burst connections
     - pool_recycle=300: Recycle connections every 5 min (Neon may close idle connections)
+
+    Both modes use pool_pre_ping to verify connections before use and a short
+    connect timeout so a cold database fails fast instead of hanging the request.
+
+    prepare_threshold=None turns off psycopg's automatic server-side prepared
+    statements. Neon's pooled endpoint (PgBouncer, transaction mode) hands each
+    transaction a different server connection, so auto-prepared statements only
+    cause extra prepare/deallocate round trips there.
     """
-    return create_engine(
+    connect_args = {"connect_timeout": 5, "prepare_threshold": None}
+
+    if os.getenv("VERCEL"):
+        return create_async_engine(
+            get_database_url(),
+            poolclass=NullPool,
+            pool_pre_ping=True,
+            connect_args={**connect_args, "sslmode": "require"},
+        )
+
+    return create_async_engine(
         get_database_url(),
         pool_pre_ping=True,
         pool_size=5,
         max_overflow=10,
         pool_recycle=300,
+        connect_args=connect_args,
     )
 
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    # Fetch server-generated columns (id, created_at) with INSERT ... RETURNING
+    # instead of a follow-up SELECT.
+    __mapper_args__ = {"eager_defaults": True}
 
 
-def _get_sessionmaker() -> sessionmaker:
-    return sessionmaker(bind=get_engine(), autoflush=False, autocommit=False)
+# Built once per process; the engine is bound lazily in get_db() so importing
+# this module (e.g. from Alembic) never requires DATABASE_URL.
+_SessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = _get_sessionmaker()()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with _SessionLocal(bind=get_engine()) as db:
         yield db
-    finally:
-        db.close()
@@ -5,17 +5,24 @@ Features:
 - Sends personalized welcome emails to new waitlist signups
 - Sends contact form notification emails to admin
 - Comprehensive failure logging
-- Serverless-compatible (no in-memory state)
+- Async sends over a shared HTTP client (keep-alive, HTTP/2), meant to be
+  dispatched via FastAPI BackgroundTasks so responses never wait on Resend
 
 Note: Rate limiting is handled by Resend's API limits.
 For stricter control, consider Upstash Redis.
 """
 
+from __future__ import annotations
+
 import logging
 import os
+import re
+from functools import lru_cache
 from html import escape
+from typing import TYPE_CHECKING
 
-import resend
+if TYPE_CHECKING:
+    import httpx
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -28,29 +35,18 @@ EMAIL_FROM = "Waitlist <onboarding@resend.dev>"
 # Set CONTACT_NOTIFY_EMAIL env var, or falls back to a default
 CONTACT_NOTIFY_EMAIL = os.getenv("CONTACT_NOTIFY_EMAIL", "admin@example.com")
 
+RESEND_API_BASE = "https://api.resend.com"
 
-def send_welcome_email(to_email: str, first_name: str = "there") -> bool:
-    """
-    Send a personalized welcome email to a new waitlist signup.
-
-    Args:
-        to_email: Recipient email address
-        first_name: User's first name for personalization
+# IPv4/IPv6 characters only; anything else is shown as "Unknown"
+_IP_RE = re.compile(r"^[0-9a-fA-F.:]{1,45}$")
 
-    Returns:
-        True if email sent successfully, False otherwise
-    """
-    # Check if Resend is configured
-    if not RESEND_API_KEY:
-        logger.warning("RESEND_API_KEY not configured, skipping email to %s", to_email)
-        return False
 
-    # Configure Resend
-    resend.api_key = RESEND_API_KEY
+# Subjects and HTML bodies are built once at import; only the placeholders are
+# filled per send. Literal CSS braces are doubled for str.format.
+_WELCOME_SUBJECT = "Welcome to the Waitlist, {first_name}! 🎉"
+_CONTACT_SUBJECT = "[Contact Form] {subject}"
 
-    # Email content (personalized)
-    subject = f"Welcome to the Waitlist, {first_name}! 🎉"
-    html_content = f"""
+_WELCOME_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -80,19 +76,122 @@ def send_welcome_email(to_email: str, first_name: str = "there") -> bool:
     </html>
     """
 
+_CONTACT_TEMPLATE = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <style>
+            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; max-width: 700px; margin: 0 auto; padding: 20px; }}
+            .header {{ font-size: 20px; font-weight: bold; margin-bottom: 20px; color: #1a1a1a; border-bottom: 2px solid #3b82f6; padding-bottom: 10px; }}
+            .meta {{ background: #f8fafc; padding: 15px; border-radius: 8px; margin: 15px 0; border-left: 4px solid #3b82f6; }}
+            .meta-row {{ margin: 8px 0; }}
+            .meta-label {{ font-weight: 600; color: #64748b; display: inline-block; width: 80px; }}
+            .message-box {{ background: #ffffff; border: 1px solid #e2e8f0; padding: 20px; border-radius: 8px; margin: 20px 0; }}
+            .message-content {{ white-space: pre-wrap; word-wrap: break-word; }}
+            .footer {{ font-size: 12px; color: #94a3b8; margin-top: 30px; border-top: 1px solid #e2e8f0; padding-top: 15px; }}
+            .reply-btn {{ display: inline-block; background: #3b82f6; color: #ffffff; padding: 10px 20px; border-radius: 6px; text-decoration: none; margin-top: 15px; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">📬 New Contact Form Submission</div>
+        
+        <div class="meta">
+            <div class="meta-row"><span class="meta-label">From:</span> {safe_name}</div>
+            <div class="meta-row"><span class="meta-label">Email:</span> <a href="mailto:{safe_email}">{safe_email}</a></div>
+            <div class="meta-row"><span class="meta-label">Subject:</span> {safe_subject}</div>
+            <div class="meta-row"><span class="meta-label">IP:</span> {safe_ip}</div>
+        </div>
+        
+        <div class="message-box">
+            <div class="message-content">{safe_message}</div>
+        </div>
+        
+        <a href="mailto:{safe_email}?subject=Re: {safe_subject}" class="reply-btn">Reply to {safe_name}</a>
+        
+        <div class="footer">
+            <p>This message was sent via your website's contact form.</p>
+        </div>
+    </body>
+    </html>
+    """
+
+
+def _escape_fields(**fields: str) -> dict[str, str]:
+    """HTML-escape user-provided values before they are placed in a template."""
+    return {key: escape(value) for key, value in fields.items()}
+
+
+@lru_cache
+def _get_client() -> httpx.AsyncClient:
+    """
+    One client per process so TLS connections to Resend are reused across sends.
+
+    httpx (and its TLS/HTTP2 stack) is imported on the first send rather than at
+    module import, keeping it off the cold-start path of requests that never email.
+    """
+    import httpx
+
+    return httpx.AsyncClient(
+        base_url=RESEND_API_BASE,
+        http2=True,
+        timeout=5.0,
+        headers={"Authorization": f"Bearer {RESEND_API_KEY}"},
+        # HTTP/2 multiplexes concurrent sends over one connection; the cap only
+        # matters if Resend ever falls back to HTTP/1.1
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    )
+
+
+async def close_client() -> None:
+    """Close the shared client, if one was created (called on app shutdown)."""
+    if _get_client.cache_info().currsize:
+        await _get_client().aclose()
+        _get_client.cache_clear()
+
+
+async def _send(params: dict) -> dict:
+    """POST an email to the Resend API and return the decoded response body."""
+    response = await _get_client().post("/emails", json=params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def send_welcome_email(to_email: str, first_name: str = "there") -> bool:
+    """
+    Send a personalized welcome email to a new waitlist signup.
+
+    Args:
+        to_email: Recipient email address
+        first_name: User's first name for personalization
+
+    Returns:
+        True if email sent successfully, False otherwise
+    """
+    # Check if Resend is configured
+    if not RESEND_API_KEY:
+        logger.warning("RESEND_API_KEY not configured, skipping email to %s", to_email)
+        return False
+
+    import httpx
+
+    # Email content (personalized)
+    subject = _WELCOME_SUBJECT.format(first_name=first_name)
+    html_content = _WELCOME_TEMPLATE.format_map(_escape_fields(first_name=first_name))
+
     try:
-        params: resend.Emails.SendParams = {
+        params = {
             "from": EMAIL_FROM,
             "to": [to_email],
             "subject": subject,
             "html": html_content,
         }
 
-        response = resend.Emails.send(params)
+        response = await _send(params)
         logger.info("Email sent successfully to %s (id: %s)", to_email, response.get("id"))
         return True
 
-    except resend.exceptions.ResendError as e:
+    except httpx.HTTPError as e:
         logger.error("Resend API error sending to %s: %s", to_email, str(e))
         return False
     except Exception as e:
@@ -100,7 +199,7 @@ def send_welcome_email(to_email: str, first_name: str = "there") -> bool:
         return False
 
 
-def send_contact_notification(
+async def send_contact_notification(
     sender_name: str,
     sender_email: str,
     subject: str,
@@ -128,59 +227,25 @@ def send_contact_notification(
         logger.warning("CONTACT_NOTIFY_EMAIL not configured, skipping contact notification")
         return False
 
-    resend.api_key = RESEND_API_KEY
+    import httpx
 
     # Escape HTML in user-provided content
-    safe_name = escape(sender_name)
-    safe_email = escape(sender_email)
-    safe_subject = escape(subject)
-    safe_message = escape(message).replace("\n", "<br>")
-    safe_ip = escape(ip_address) if ip_address else "Unknown"
-
-    email_subject = f"[Contact Form] {subject}"
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <style>
-            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; max-width: 700px; margin: 0 auto; padding: 20px; }}
-            .header {{ font-size: 20px; font-weight: bold; margin-bottom: 20px; color: #1a1a1a; border-bottom: 2px solid #3b82f6; padding-bottom: 10px; }}
-            .meta {{ background: #f8fafc; padding: 15px; border-radius: 8px; margin: 15px 0; border-left: 4px solid #3b82f6; }}
-            .meta-row {{ margin: 8px 0; }}
-            .meta-label {{ font-weight: 600; color: #64748b; display: inline-block; width: 80px; }}
-            .message-box {{ background: #ffffff; border: 1px solid #e2e8f0; padding: 20px; border-radius: 8px; margin: 20px 0; }}
-            .message-content {{ white-space: pre-wrap; word-wrap: break-word; }}
-            .footer {{ font-size: 12px; color: #94a3b8; margin-top: 30px; border-top: 1px solid #e2e8f0; padding-top: 15px; }}
-            .reply-btn {{ display: inline-block; background: #3b82f6; color: #ffffff; padding: 10px 20px; border-radius: 6px; text-decoration: none; margin-top: 15px; }}
-        </style>
-    </head>
-    <body>
-        <div class="header">📬 New Contact Form Submission</div>
-        
-        <div class="meta">
-            <div class="meta-row"><span class="meta-label">From:</span> {safe_name}</div>
-            <div class="meta-row"><span class="meta-label">Email:</span> <a href="mailto:{safe_email}">{safe_email}</a></div>
-            <div class="meta-row"><span class="meta-label">Subject:</span> {safe_subject}</div>
-            <div class="meta-row"><span class="meta-label">IP:</span> {safe_ip}</div>
-        </div>
-        
-        <div class="message-box">
-            <div class="message-content">{safe_message}</div>
-        </div>
-        
-        <a href="mailto:{safe_email}?subject=Re: {safe_subject}" class="reply-btn">Reply to {safe_name}</a>
-        
-        <div class="footer">
-            <p>This message was sent via your website's contact form.</p>
-        </div>
-    </body>
-    </html>
-    """
+    fields = _escape_fields(
+        safe_name=sender_name,
+        safe_email=sender_email,
+        safe_subject=subject,
+        safe_message=message,
+    )
+    fields["safe_message"] = fields["safe_message"].replace("\n", "<br>")
+    # Nothing to escape in a string of hex digits, dots and colons
+    fields["safe_ip"] = ip_address if ip_address and _IP_RE.match(ip_address) else "Unknown"
+
+    email_subject = _CONTACT_SUBJECT.format(subject=subject)
+
+    html_content = _CONTACT_TEMPLATE.format_map(fields)
 
     try:
-        params: resend.Emails.SendParams = {
+        params = {
             "from": EMAIL_FROM,
             "to": [CONTACT_NOTIFY_EMAIL],
             "reply_to": sender_email,
@@ -188,7 +253,7 @@ def send_contact_notification(
             "html": html_content,
         }
 
-        response = resend.Emails.send(params)
+        response = await _send(params)
         logger.info(
             "Contact notification sent (id: %s) from %s <%s>",
             response.get("id"),
@@ -197,7 +262,7 @@ def send_contact_notification(
         )
         return True
 
-    except resend.exceptions.ResendError as e:
+    except httpx.HTTPError as e:
         logger.error("Resend API error for contact notification: %s", str(e))
         return False
     except Exception as e:
@@ -0,0 +1,75 @@
+"""
+One-shot database setup: `python -m app.init_db` (or `make init-db`).
+
+- Empty database: load the consolidated schema in schema/initial.sql in a
+  single round trip, stamp Alembic at the revision it was generated from, then
+  apply any migrations newer than that.
+- Existing database: plain `alembic upgrade head`.
+
+Replaying every migration on a fresh database means one transaction, catalog
+probe, backfill and index build per revision for tables that are empty anyway.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import NullPool
+
+from app.db import get_database_url
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+INITIAL_SCHEMA = ROOT / "schema" / "initial.sql"
+
+_REVISION_RE = re.compile(r"^-- revision: (\S+)$", re.MULTILINE)
+
+
+def _is_empty_database() -> bool:
+    engine = create_engine(get_database_url(), poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            tables = set(inspect(conn).get_table_names())
+    finally:
+        engine.dispose()
+    return not tables & {"alembic_version", "waitlist", "contact_messages"}
+
+
+def _load_initial_schema() -> str:
+    """Execute schema/initial.sql and return the revision it corresponds to."""
+    sql = INITIAL_SCHEMA.read_text()
+    match = _REVISION_RE.search(sql)
+    if not match:
+        raise RuntimeError(f"{INITIAL_SCHEMA} has no '-- revision: <id>' header")
+
+    engine = create_engine(get_database_url(), poolclass=NullPool)
+    try:
+        with engine.begin() as conn:
+            # No bind parameters, so psycopg sends the whole file as one simple query
+            conn.exec_driver_sql(sql)
+    finally:
+        engine.dispose()
+    return match.group(1)
+
+
+def main() -> None:
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+
+    if _is_empty_database():
+        revision = _load_initial_schema()
+        logger.info("Empty database: loaded %s (revision %s)", INITIAL_SCHEMA.name, revision)
+        command.stamp(config, revision)
+
+    command.upgrade(config, "head")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    main()
@@ -1,12 +1,31 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.email import close_client as close_email_client
+from app.redis_client import close_redis
 from app.routes import router
 from app import models_db  # noqa: F401  (ensures model is registered for tooling)
 
-app = FastAPI(title="Waitlist API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shared HTTP/Redis clients are created lazily; release their sockets on shutdown
+    await close_email_client()
+    await close_redis()
+
+
+# orjson encodes responses in C instead of going through json.dumps
+app = FastAPI(
+    title="Waitlist API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS configuration
 # Set ALLOWED_ORIGINS env var to restrict (comma-separated), or leave unset to allow all
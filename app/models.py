@@ -1,50 +1,15 @@
 import re
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, Field, IPvAnyAddress, field_validator, model_validator
 
-
-def normalize_nigerian_phone(phone: str) -> str:
-    """
-    Normalize Nigerian phone number to +234 format.
-    
-    Accepts:
-    - Local format: 08012345678 → +2348012345678
-    - International: +2348012345678 → +2348012345678
-    - With spaces/dashes: 080-1234-5678 → +2348012345678
-    """
-    # Remove spaces, dashes, parentheses
-    cleaned = re.sub(r"[\s\-\(\)]+", "", phone)
-    
-    # If starts with 0, replace with +234
-    if cleaned.startswith("0"):
-        cleaned = "+234" + cleaned[1:]
-    # If starts with 234 (no +), add +
-    elif cleaned.startswith("234"):
-        cleaned = "+" + cleaned
-    # If doesn't start with +234, assume local and add prefix
-    elif not cleaned.startswith("+234"):
-        cleaned = "+234" + cleaned
-    
-    return cleaned
-
-
-def validate_nigerian_phone(phone: str) -> str:
-    """Validate and normalize Nigerian phone number."""
-    normalized = normalize_nigerian_phone(phone)
-    
-    # Nigerian numbers: +234 followed by 10 digits
-    # Valid prefixes after 234: 70, 80, 81, 90, 91, etc.
-    pattern = r"^\+234[789][01]\d{8}$"
-    
-    if not re.match(pattern, normalized):
-        raise ValueError(
-            "Invalid Nigerian phone number. "
-            "Expected format: 08012345678 or +2348012345678"
-        )
-    
-    return normalized
+from app.validators import (
+    contains_excessive_links,
+    detect_spam_signals,
+    is_gibberish,
+    validate_nigerian_phone,
+)
 
 
 class WaitlistIn(BaseModel):
@@ -54,10 +19,25 @@ class WaitlistIn(BaseModel):
     phone: str = Field(..., description="Nigerian phone number (e.g., 08012345678)")
     source: str | None = Field(default=None, max_length=100)
 
-    @field_validator("first_name", "last_name")
+    @model_validator(mode="before")
+    @classmethod
+    def strip_and_title_case(cls, data: Any) -> Any:
+        # One callback for both names instead of one per field. Runs before field
+        # validation, so non-strings are left for the str type check to reject,
+        # and the length limits apply to the stripped value.
+        if isinstance(data, dict):
+            data = dict(data)  # don't modify the caller's dict
+            for key in ("first_name", "last_name"):
+                value = data.get(key)
+                if isinstance(value, str):
+                    data[key] = value.strip().title()
+        return data
+
+    @field_validator("email")
     @classmethod
-    def strip_and_title_case(cls, v: str) -> str:
-        return v.strip().title()
+    def lowercase_email(cls, v: str) -> str:
+        # Canonical form stored in the database; uniqueness is on the plain column
+        return v.lower()
 
     @field_validator("phone")
     @classmethod
@@ -75,63 +55,26 @@ class WaitlistOut(BaseModel):
     created_at: datetime
 
 
-# =============================================================================
-# Contact Us Models
-# =============================================================================
-
-# Common spam phrases to detect
-SPAM_PATTERNS = [
-    r"\b(viagra|cialis|casino|lottery|winner|prize|click here|act now)\b",
-    r"\b(earn money|make money fast|work from home|mlm)\b",
-    r"\b(crypto|bitcoin|investment opportunity|guaranteed returns)\b",
-    r"(https?://\S+){3,}",  # 3+ URLs is suspicious
-    r"(.)\1{10,}",  # 10+ repeated characters
-]
+# Keeps one batch INSERT well under Postgres's 65535 bind-parameter limit
+WAITLIST_BATCH_MAX = 1000
 
-# Compile patterns for performance
-SPAM_REGEX = [re.compile(p, re.IGNORECASE) for p in SPAM_PATTERNS]
 
+class WaitlistBatchIn(BaseModel):
+    items: list[WaitlistIn] = Field(..., min_length=1, max_length=WAITLIST_BATCH_MAX)
 
-def detect_spam_signals(text: str) -> list[str]:
-    """
-    Detect spam signals in text. Returns list of triggered patterns.
-    """
-    signals = []
-    for pattern in SPAM_REGEX:
-        if pattern.search(text):
-            signals.append(pattern.pattern)
-    return signals
 
+class WaitlistBatchOut(BaseModel):
+    inserted: list[WaitlistOut]
+    duplicates: list[int] = Field(
+        ..., description="Indexes into items that were already on the waitlist"
+    )
 
-def contains_excessive_links(text: str) -> bool:
-    """Check if text contains excessive URLs (common spam indicator)."""
-    url_pattern = r"https?://\S+"
-    urls = re.findall(url_pattern, text, re.IGNORECASE)
-    return len(urls) > 2
 
+# =============================================================================
+# Contact Us Models
+# =============================================================================
 
-def is_gibberish(text: str) -> bool:
-    """
-    Basic gibberish detection:
-    - Very low ratio of vowels to consonants
-    - Excessive special characters
-    """
-    if len(text) < 10:
-        return False
-    
-    # Count vowels vs consonants
-    vowels = len(re.findall(r"[aeiouAEIOU]", text))
-    consonants = len(re.findall(r"[bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ]", text))
-    
-    if consonants > 0 and vowels / consonants < 0.1:
-        return True
-    
-    # Excessive special characters
-    special = len(re.findall(r"[^a-zA-Z0-9\s.,!?'-]", text))
-    if special > len(text) * 0.3:
-        return True
-    
-    return False
+_ASCII_LETTER_RE = re.compile(r"[a-zA-Z]")
 
 
 class ContactMessageIn(BaseModel):
@@ -180,12 +123,10 @@ class ContactMessageIn(BaseModel):
     @classmethod
     def validate_name(cls, v: str) -> str:
         v = v.strip()
-        # Name should contain at least one letter
-        if not re.search(r"[a-zA-Z]", v):
+        # Name should contain at least one letter. That also rules out names made
+        # only of digits/special characters, so no separate check is needed.
+        if not _ASCII_LETTER_RE.search(v):
             raise ValueError("Name must contain at least one letter")
-        # Block names that are just numbers or special chars
-        if re.match(r"^[\d\W]+$", v):
-            raise ValueError("Invalid name format")
         return v
 
     @field_validator("subject")
@@ -241,6 +182,29 @@ class ContactMessageOut(BaseModel):
         from_attributes = True
 
 
+class ContactMessageSummary(BaseModel):
+    """One row of the admin contact list; the body is cut to a preview."""
+    id: int
+    name: str
+    email: str
+    subject: str
+    message_preview: str
+    ip_address: IPvAnyAddress | None
+    is_spam: bool
+    is_read: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ContactMessageList(BaseModel):
+    """Admin contact list page; pass next_cursor back as ?before= for the next one."""
+    count: int
+    messages: list[ContactMessageSummary]
+    next_cursor: datetime | None = None
+
+
 class ContactMessageResponse(BaseModel):
     """
     User-friendly response for contact form submission.
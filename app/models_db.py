@@ -1,17 +1,32 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, func
+from datetime import datetime
+from ipaddress import IPv4Address, IPv6Address
+
+from sqlalchemy import BigInteger, String, DateTime, Text, Boolean, CheckConstraint, Index, func
+from sqlalchemy.dialects.postgresql import INET
+from sqlalchemy.orm import Mapped, mapped_column
+
 from app.db import Base
 
 
 class WaitlistEntry(Base):
     __tablename__ = "waitlist"
 
-    id = Column(Integer, primary_key=True, index=True)
-    first_name = Column(String(50), nullable=False)
-    last_name = Column(String(50), nullable=False)
-    email = Column(String(320), nullable=False, unique=True, index=True)
-    phone = Column(String(20), nullable=False, unique=True, index=True)
-    source = Column(String(100), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
+    first_name: Mapped[str] = mapped_column(String(50))
+    last_name: Mapped[str] = mapped_column(String(50))
+    email: Mapped[str] = mapped_column(String(320))
+    phone: Mapped[str] = mapped_column(String(20))
+    source: Mapped[str | None] = mapped_column(String(100))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    # Emails are stored lowercased (enforced by the check constraint), so a plain
+    # unique index gives case-insensitive uniqueness. Each unique index is the
+    # only index on its column: it serves lookups too.
+    __table_args__ = (
+        CheckConstraint("email = lower(email)", name="ck_waitlist_email_lowercase"),
+        Index("uq_waitlist_email", email, unique=True),
+        Index("uq_waitlist_phone", phone, unique=True),
+    )
 
 
 class ContactMessage(Base):
@@ -23,18 +38,34 @@ class ContactMessage(Base):
     """
     __tablename__ = "contact_messages"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False)
-    email = Column(String(320), nullable=False, index=True)
-    subject = Column(String(200), nullable=False)
-    message = Column(Text, nullable=False)
+    # Stored lowercased so rate-limit lookups can use the plain (email, created_at) index
+    __table_args__ = (
+        CheckConstraint("email = lower(email)", name="ck_contact_messages_email_lowercase"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(100))
+    email: Mapped[str] = mapped_column(String(320))
+    subject: Mapped[str] = mapped_column(String(200))
+    message: Mapped[str] = mapped_column(Text)
     
     # Anti-spam metadata
-    ip_address = Column(String(45), nullable=True, index=True)  # IPv6 max length
-    user_agent = Column(String(500), nullable=True)
+    ip_address: Mapped[IPv4Address | IPv6Address | None] = mapped_column(INET)  # psycopg returns ipaddress objects
+    user_agent: Mapped[str | None] = mapped_column(Text)  # Truncated to 500 chars by the service
     
     # Processing status
-    is_spam = Column(Boolean, default=False, nullable=False)
-    is_read = Column(Boolean, default=False, nullable=False)
+    is_spam: Mapped[bool] = mapped_column(Boolean, default=False)
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+    # Bumped on every status change; MAX(updated_at) versions the admin list (ETag).
+    # clock_timestamp(), not now(): now() is the transaction start, which can be
+    # older than a MAX already handed out by the time the write commits.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.clock_timestamp(),
+        onupdate=func.clock_timestamp(),
+        index=True,
+    )
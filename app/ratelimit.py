@@ -0,0 +1,167 @@
+"""
+Redis sliding-window rate limiting.
+
+Each limited identity keeps one integer counter per fixed window (bucket). The
+sliding count is approximated from the current and previous buckets, weighting
+the previous one by how much of it still overlaps the window:
+
+    estimate = previous * (time left in current bucket / window) + current
+
+That is O(1) work and two small integers per identity, instead of a sorted set
+holding every attempt. One Lua script checks every key against its limit and,
+only if all pass, counts the attempt in all of them: one Redis round trip per
+submission, and because the script runs atomically, concurrent requests can't
+both slip under a limit.
+
+Redis is optional: check_sliding_window returns None when it isn't configured
+or doesn't answer, and the caller falls back to counting rows in Postgres.
+
+In front of either sits a per-process filter (local_window_exceeded /
+record_local_hit) that remembers the attempts this process let through, so a
+client flooding one instance is turned away without any network round trip.
+It rejects only when both the exact window and the two-bucket estimate are at
+the limit, so it never refuses what either shared check would allow.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.redis_client import get_redis
+
+if TYPE_CHECKING:
+    from redis.commands.core import AsyncScript
+
+logger = logging.getLogger(__name__)
+
+# KEYS: the current and previous bucket counters of each identity, in pairs
+# ARGV: weight of the previous bucket, counter TTL (seconds), then one limit
+#       per identity
+# Returns 0 when the attempt was recorded, else the 1-based index of the first
+# identity that is already at its limit (nothing is recorded in that case).
+_SLIDING_WINDOW_LUA = """
+local weight = tonumber(ARGV[1])
+for i = 1, #KEYS / 2 do
+    local counts = redis.call('MGET', KEYS[2 * i - 1], KEYS[2 * i])
+    local estimate = (tonumber(counts[2]) or 0) * weight + (tonumber(counts[1]) or 0)
+    if estimate >= tonumber(ARGV[2 + i]) then
+        return i
+    end
+end
+for i = 1, #KEYS / 2 do
+    redis.call('INCR', KEYS[2 * i - 1])
+    redis.call('EXPIRE', KEYS[2 * i - 1], ARGV[2])
+end
+return 0
+"""
+
+
+def _window_position(now: float, window_seconds: int) -> tuple[int, float]:
+    """The current bucket number, and the share of the previous bucket still inside the window."""
+    return int(now // window_seconds), (window_seconds - now % window_seconds) / window_seconds
+
+
+@lru_cache
+def _get_script() -> AsyncScript | None:
+    """Register the script once per process (redis-py then calls it by SHA)."""
+    client = get_redis()
+    if client is None:
+        return None
+    return client.register_script(_SLIDING_WINDOW_LUA)
+
+
+async def check_sliding_window(
+    keys: list[str],
+    limits: list[int],
+    window_seconds: int,
+) -> int | None:
+    """
+    Check and record one attempt against several sliding-window limits at once.
+
+    Args:
+        keys: Redis key prefixes, one per limited identity (e.g. IP, email). On
+            Redis Cluster they must share a hash tag, since one script touches
+            all of them.
+        limits: Max attempts allowed in the window, one per key
+        window_seconds: Window length
+
+    Returns:
+        0 if the attempt is allowed (and was recorded), the 1-based index of the
+        first key over its limit otherwise, or None if Redis is unavailable.
+    """
+    script = _get_script()
+    if script is None:
+        return None
+
+    bucket, weight = _window_position(time.time(), window_seconds)
+
+    # Bucket key names are built here, not in the script, so every key it
+    # touches is declared in KEYS (required by Cluster and proxies)
+    bucket_keys = [f"{key}:{b}" for key in keys for b in (bucket, bucket - 1)]
+    # Kept through the next bucket, where it is the previous count
+    args = [weight, 2 * window_seconds, *limits]
+    try:
+        return int(await script(keys=bucket_keys, args=args))
+    except Exception as e:
+        logger.warning("Redis rate limit check failed, falling back to database: %s", str(e))
+        return None
+
+
+# Accepted attempts seen by this process: key -> wall-clock times of the last
+# `limit` of them. A hard-capped LRU: keys come from client-controlled headers
+# and emails, so the least recently recorded are dropped past this size.
+_LOCAL_MAX_KEYS = 10_000
+_local_hits: OrderedDict[str, deque[float]] = OrderedDict()
+
+
+def local_window_exceeded(keys: list[str], limits: list[int], window_seconds: int) -> int:
+    """
+    Check attempts against this process's own record of accepted ones.
+
+    A key counts as over its limit only when both shared checks would say so
+    about the same attempts: `limit` of them fall inside the exact window (the
+    Postgres fallback's view) and their two-bucket estimate reaches the limit
+    too (the Redis script's view). Every recorded attempt was also stored by
+    whichever check accepted it, so the local answer is never stricter.
+
+    Returns:
+        The 1-based index of the first key over its limit, or 0. 0 says
+        nothing either way.
+    """
+    now = time.time()
+    bucket, weight = _window_position(now, window_seconds)
+    for i, (key, limit) in enumerate(zip(keys, limits), 1):
+        hits = _local_hits.get(key)
+        if not hits or len(hits) < limit or now - hits[0] >= window_seconds:
+            continue
+        estimate = 0.0
+        for hit in hits:
+            hit_bucket = int(hit // window_seconds)
+            if hit_bucket == bucket:
+                estimate += 1
+            elif hit_bucket == bucket - 1:
+                estimate += weight
+        if estimate >= limit:
+            return i
+    return 0
+
+
+def record_local_hit(keys: list[str], limits: list[int]) -> None:
+    """Remember an attempt the shared check accepted, for local_window_exceeded."""
+    now = time.time()
+    for key, limit in zip(keys, limits):
+        if limit <= 0:
+            continue
+        hits = _local_hits.get(key)
+        if hits is None:
+            hits = _local_hits[key] = deque(maxlen=limit)
+        else:
+            _local_hits.move_to_end(key)
+        hits.append(now)
+
+    while len(_local_hits) > _LOCAL_MAX_KEYS:
+        _local_hits.popitem(last=False)
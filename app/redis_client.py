@@ -0,0 +1,94 @@
+"""
+Optional Redis cache (e.g. Upstash).
+
+Redis is never the source of truth: when REDIS_URL is unset every helper is a
+no-op and callers fall back to Postgres. Errors talking to Redis are logged and
+treated the same way, so a cache outage can't fail a request.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+
+@lru_cache
+def get_redis() -> Redis | None:
+    """
+    One client (and connection pool) per process, or None when Redis isn't configured.
+
+    Short socket timeouts keep a slow or unreachable Redis from stalling requests.
+    """
+    if not REDIS_URL:
+        return None
+
+    import redis.asyncio as redis
+
+    return redis.Redis.from_url(
+        REDIS_URL,
+        decode_responses=False,
+        socket_connect_timeout=1.0,
+        socket_timeout=0.5,
+    )
+
+
+async def close_redis() -> None:
+    """Close the shared client's connection pool, if one was created (called on app shutdown)."""
+    if get_redis.cache_info().currsize and (client := get_redis()) is not None:
+        await client.aclose()
+    get_redis.cache_clear()
+
+
+async def cache_get(key: str) -> bytes | None:
+    """Return the cached value for key, or None on a miss or when Redis is unavailable."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except Exception as e:
+        logger.warning("Redis GET %s failed: %s", key, str(e))
+        return None
+
+
+async def cache_set(key: str, value: bytes, ttl_seconds: int) -> None:
+    """Store value under key for ttl_seconds (best effort)."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, value, ex=ttl_seconds)
+    except Exception as e:
+        logger.warning("Redis SET %s failed: %s", key, str(e))
+
+
+async def bump_generation(key: str) -> int | None:
+    """
+    Move the generation counter at key on and return it, or None on failure.
+
+    A missing counter (never set, or evicted) starts from the current time in
+    nanoseconds rather than 0, so a restarted counter never hands out a
+    generation an older cache entry could still be stored under.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(key, time.time_ns(), nx=True)
+            pipe.incr(key)
+            _, generation = await pipe.execute()
+        return generation
+    except Exception as e:
+        logger.warning("Redis INCR %s failed: %s", key, str(e))
+        return None
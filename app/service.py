@@ -1,67 +1,142 @@
+import hashlib
 import os
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException
-from sqlalchemy import func
+from sqlalchemy import ColumnElement, Select, cast, exists, false, insert, literal, select, true
+from sqlalchemy.dialects.postgresql import INET, insert as pg_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import ContactMessageIn, WaitlistIn
 from app.models_db import ContactMessage, WaitlistEntry
+from app.ratelimit import check_sliding_window, local_window_exceeded, record_local_hit
+from app.redis_client import bump_generation
 
+# Cached /admin/export body (only used when REDIS_URL is set). Bodies are stored
+# under EXPORT_CACHE_KEY:<generation>; every signup bumps the generation, so an
+# export that was still streaming when someone joined can't be served later.
+EXPORT_CACHE_KEY = "export:waitlist:v1"
+EXPORT_GENERATION_KEY = "export:waitlist:generation"
+EXPORT_CACHE_TTL_SECONDS = int(os.getenv("EXPORT_CACHE_TTL_SECONDS", "300"))
 
-def _is_unique_violation(err: IntegrityError) -> bool:
-    # Postgres unique violation is SQLSTATE 23505 across psycopg2/psycopg3.
-    orig = getattr(err, "orig", None)
-    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
-    return sqlstate == "23505"
 
-
-def _get_duplicate_field(err: IntegrityError) -> str:
-    """Try to determine which field caused the unique violation."""
-    error_msg = str(err.orig).lower() if err.orig else ""
-    if "email" in error_msg:
+async def _find_duplicate_field(db: AsyncSession, email: str, phone: str) -> str:
+    """Work out which unique field an ignored signup collided with (email first)."""
+    email_taken, phone_taken = (
+        await db.execute(
+            select(
+                exists().where(WaitlistEntry.email == email),
+                exists().where(WaitlistEntry.phone == phone),
+            )
+        )
+    ).one()
+    if email_taken:
         return "Email"
-    elif "phone" in error_msg:
+    if phone_taken:
         return "Phone number"
+    # The conflicting row disappeared between the two statements
     return "Email or phone number"
 
 
-def add_to_waitlist(db: Session, payload: WaitlistIn):
-    email = str(payload.email).strip().lower()
+# Built once at import and executed with a parameter dict, so requests skip
+# constructing the statement and always hit the same compiled-cache entry.
+# A duplicate email or phone makes Postgres skip the row instead of raising,
+# so the common path is one statement with no error/rollback round trip.
+# Built on the Table rather than the mapped class: a Core insert skips the
+# ORM bulk-insert machinery, and RETURNING supplies everything the response needs.
+_INSERT_WAITLIST = (
+    pg_insert(WaitlistEntry.__table__)
+    .on_conflict_do_nothing()
+    .returning(*WaitlistEntry.__table__.c)
+)
 
-    entry = WaitlistEntry(
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-        email=email,
-        phone=payload.phone,  # Already normalized by validator
-        source=payload.source,
-    )
-    db.add(entry)
+
+async def add_to_waitlist(db: AsyncSession, payload: WaitlistIn):
+    email = payload.email  # Already lowercased by validator
+
+    values = {
+        "first_name": payload.first_name,
+        "last_name": payload.last_name,
+        "email": email,
+        "phone": payload.phone,  # Already normalized by validator
+        "source": payload.source,
+    }
 
     try:
-        db.commit()
-    except IntegrityError as e:
-        db.rollback()
-        if _is_unique_violation(e):
-            field = _get_duplicate_field(e)
+        row = (await db.execute(_INSERT_WAITLIST, values)).first()
+        if row is None:
+            field = await _find_duplicate_field(db, email, payload.phone)
+            await db.rollback()
             raise HTTPException(status_code=409, detail=f"{field} already on waitlist")
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database integrity error")
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Database error")
 
-    db.refresh(entry)
+    # A new signup makes any cached export stale
+    await bump_generation(EXPORT_GENERATION_KEY)
 
-    return {
-        "id": entry.id,
-        "first_name": entry.first_name,
-        "last_name": entry.last_name,
-        "email": entry.email,
-        "phone": entry.phone,
-        "source": entry.source,
-        "created_at": entry.created_at,
-    }
+    return dict(row._mapping)
+
+
+async def add_many_to_waitlist(
+    db: AsyncSession,
+    items: list[WaitlistIn],
+) -> tuple[list[dict], list[int]]:
+    """
+    Insert many signups with a single INSERT ... ON CONFLICT DO NOTHING RETURNING.
+    
+    Args:
+        db: Database session
+        items: Validated signups (WaitlistBatchIn caps how many)
+    
+    Returns:
+        The inserted rows, and the indexes of items that were skipped because
+        their email or phone is already on the waitlist (or earlier in the batch)
+    """
+    waitlist = WaitlistEntry.__table__
+    stmt = (
+        pg_insert(waitlist)
+        .values([
+            {
+                "first_name": item.first_name,
+                "last_name": item.last_name,
+                "email": item.email,
+                "phone": item.phone,
+                "source": item.source,
+            }
+            for item in items
+        ])
+        .on_conflict_do_nothing()
+        .returning(*waitlist.c)
+    )
+
+    try:
+        rows = [dict(row._mapping) for row in await db.execute(stmt)]
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error")
+
+    if rows:
+        await bump_generation(EXPORT_GENERATION_KEY)
+
+    # RETURNING order isn't guaranteed, so match rows back to items by their
+    # unique (email, phone); a repeat within the batch only matches once
+    inserted = {(row["email"], row["phone"]) for row in rows}
+    duplicates = []
+    for index, item in enumerate(items):
+        key = (item.email, item.phone)
+        if key in inserted:
+            inserted.remove(key)
+        else:
+            duplicates.append(index)
+
+    return rows, duplicates
 
 
 # =============================================================================
@@ -82,55 +157,119 @@ class RateLimitExceeded(Exception):
     pass
 
 
-def check_contact_rate_limit(
-    db: Session,
+_IP_LIMIT_MESSAGE = "Too many requests from this IP. Please try again later."
+_EMAIL_LIMIT_MESSAGE = "Too many requests from this email. Please try again later."
+
+
+def _rate_limit_keys(
     ip_address: str | None,
-    email: str,
-) -> None:
+    email_lower: str,
+) -> tuple[list[str], list[int], list[str]]:
+    """Keys, limits and error messages for the in-process and Redis checks (IP first)."""
+    keys: list[str] = []
+    limits: list[int] = []
+    messages: list[str] = []
+    # The {contact} hash tag keeps every key one script call touches in the
+    # same Redis Cluster slot
+    if ip_address:
+        keys.append(f"{{contact}}:ip:{ip_address}")
+        limits.append(CONTACT_RATE_LIMIT_IP)
+        messages.append(_IP_LIMIT_MESSAGE)
+    # Hashed so key length doesn't depend on user input
+    keys.append(f"{{contact}}:email:{hashlib.sha1(email_lower.encode()).hexdigest()}")
+    limits.append(CONTACT_RATE_LIMIT_EMAIL)
+    messages.append(_EMAIL_LIMIT_MESSAGE)
+    return keys, limits, messages
+
+
+def _insert_contact_within_limits(message: dict) -> Select:
     """
-    Check if the IP or email has exceeded rate limits.
-    
-    This uses the database as the source of truth for rate limiting,
-    which works reliably across serverless instances.
-    
-    Raises:
-        RateLimitExceeded: If rate limit is exceeded
+    Database fallback: insert the message only if neither its IP nor its email
+    is at the limit, in one statement.
+
+    WITH limits AS (SELECT <ip at limit>, <email at limit>),
+         inserted AS (INSERT ... SELECT <values> WHERE NOT both RETURNING ...)
+    SELECT the two flags and the new id / created_at (NULL when refused)
     """
     window_start = datetime.now(timezone.utc) - timedelta(minutes=CONTACT_RATE_WINDOW_MINUTES)
-    
-    # Check IP rate limit (if IP is provided)
-    if ip_address:
-        ip_count = db.query(func.count(ContactMessage.id)).filter(
-            ContactMessage.ip_address == ip_address,
-            ContactMessage.created_at >= window_start,
-        ).scalar()
-        
-        if ip_count >= CONTACT_RATE_LIMIT_IP:
-            raise RateLimitExceeded(
-                f"Too many requests from this IP. Please try again later."
-            )
-    
-    # Check email rate limit
-    email_lower = email.strip().lower()
-    email_count = db.query(func.count(ContactMessage.id)).filter(
-        func.lower(ContactMessage.email) == email_lower,
+
+    # Each flag is an EXISTS subquery on its own (ip_address, created_at) /
+    # (email, created_at) index. Emails are stored lowercased, so plain
+    # equality matches case-insensitively.
+    email_at_limit = _at_limit(
+        CONTACT_RATE_LIMIT_EMAIL,
+        ContactMessage.email == message["email"],
         ContactMessage.created_at >= window_start,
-    ).scalar()
-    
-    if email_count >= CONTACT_RATE_LIMIT_EMAIL:
-        raise RateLimitExceeded(
-            f"Too many requests from this email. Please try again later."
+    )
+    if message["ip_address"]:
+        ip_at_limit = _at_limit(
+            CONTACT_RATE_LIMIT_IP,
+            ContactMessage.ip_address == cast(message["ip_address"], INET),
+            ContactMessage.created_at >= window_start,
+        )
+    else:
+        ip_at_limit = false()
+
+    limits = select(
+        ip_at_limit.label("ip_at_limit"),
+        email_at_limit.label("email_at_limit"),
+    ).cte("limits")
+
+    contacts = ContactMessage.__table__
+    inserted = (
+        insert(contacts)
+        .from_select(
+            list(message),
+            select(*(literal(value, contacts.c[key].type) for key, value in message.items()))
+            .where(~limits.c.ip_at_limit, ~limits.c.email_at_limit),
         )
+        .returning(contacts.c.id, contacts.c.created_at)
+        .cte("inserted")
+    )
+
+    return select(
+        limits.c.ip_at_limit,
+        limits.c.email_at_limit,
+        inserted.c.id,
+        inserted.c.created_at,
+    ).select_from(limits.outerjoin(inserted, true()))
 
 
-def save_contact_message(
-    db: Session,
+def _at_limit(limit: int, *conditions: ColumnElement[bool]) -> ColumnElement[bool]:
+    """
+    SQL expression: do at least `limit` submissions match `conditions`?
+
+    Same answer as count(*) >= limit, but the subquery (OFFSET limit-1 LIMIT 1)
+    stops at the limit-th matching index entry instead of counting every
+    submission in the window, so a flood doesn't make the check slower.
+    """
+    if limit <= 0:
+        return true()
+    return exists(select(literal(1)).where(*conditions).offset(limit - 1).limit(1))
+
+
+# Built once at import, like _INSERT_WAITLIST. A Core insert on the Table skips
+# ORM instrumentation and the unit of work; only server-generated columns come back.
+_INSERT_CONTACT = insert(ContactMessage.__table__).returning(
+    ContactMessage.__table__.c.id, ContactMessage.__table__.c.created_at
+)
+
+
+async def save_contact_message(
+    db: AsyncSession,
     payload: ContactMessageIn,
     ip_address: str | None = None,
     user_agent: str | None = None,
-) -> ContactMessage:
+) -> dict:
     """
-    Save a contact form submission to the database.
+    Rate-limit and save a contact form submission.
+    
+    Attempts this process already knows to be over a limit are rejected
+    without any I/O. Otherwise, with Redis configured, both limits are checked
+    (and the attempt recorded) by one sliding-window script before a plain
+    insert. Without Redis, or if it fails, the limits are checked against
+    recent submissions in Postgres by the INSERT statement itself, which
+    works reliably across serverless instances.
     
     Args:
         db: Database session
@@ -139,37 +278,56 @@ def save_contact_message(
         user_agent: Client user agent (for spam analysis)
     
     Returns:
-        The saved ContactMessage instance
+        The saved message's columns, including its id and created_at
     
     Raises:
         RateLimitExceeded: If rate limit is exceeded
         HTTPException: For database errors
     """
-    # Check rate limits first
-    check_contact_rate_limit(db, ip_address, str(payload.email))
-    
     # Normalize email
     email = str(payload.email).strip().lower()
+
+    keys, limits, messages = _rate_limit_keys(ip_address, email)
+    window_seconds = CONTACT_RATE_WINDOW_MINUTES * 60
+
+    # A flood against this instance is rejected here, before Redis or Postgres
+    if exceeded := local_window_exceeded(keys, limits, window_seconds):
+        raise RateLimitExceeded(messages[exceeded - 1])
+
+    exceeded = await check_sliding_window(keys, limits, window_seconds)
+    if exceeded:
+        raise RateLimitExceeded(messages[exceeded - 1])
     
-    # Create the message entry
-    message = ContactMessage(
-        name=payload.name.strip(),
-        email=email,
-        subject=payload.subject.strip(),
-        message=payload.message.strip(),
-        ip_address=ip_address,
-        user_agent=user_agent[:500] if user_agent else None,  # Truncate long user agents
-        is_spam=False,
-        is_read=False,
-    )
-    
-    db.add(message)
+    message = {
+        "name": payload.name.strip(),
+        "email": email,
+        "subject": payload.subject.strip(),
+        "message": payload.message.strip(),
+        "ip_address": ip_address,
+        "user_agent": user_agent[:500] if user_agent else None,  # Truncate long user agents
+        "is_spam": False,
+        "is_read": False,
+    }
     
     try:
-        db.commit()
+        if exceeded is None:
+            # No Redis: the limit check and the insert are one round trip
+            row = (await db.execute(_insert_contact_within_limits(message))).one()
+            if row.id is None:
+                await db.rollback()
+                # IP limit first, as before
+                if row.ip_at_limit:
+                    raise RateLimitExceeded(_IP_LIMIT_MESSAGE)
+                raise RateLimitExceeded(_EMAIL_LIMIT_MESSAGE)
+        else:
+            row = (await db.execute(_INSERT_CONTACT, message)).one()
+        await db.commit()
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to save message")
+
+    record_local_hit(keys, limits)
     
-    db.refresh(message)
+    message["id"] = row.id
+    message["created_at"] = row.created_at
     return message
@@ -0,0 +1,181 @@
+"""
+Input checks shared by the request models in app/models.py.
+
+Every pattern and translate table is built once, at import; the functions
+only run them.
+"""
+
+import re
+import string
+from itertools import islice
+
+
+# =============================================================================
+# Phone numbers
+# =============================================================================
+
+# Separators people type or paste into phone numbers, deleted in one C-level
+# pass: "-", "(", ")" and any Unicode whitespace (NBSP, thin space, ...; none
+# is above U+3000)
+_PHONE_STRIP = str.maketrans(
+    "", "", "-()" + "".join(ch for ch in map(chr, range(0x3001)) if ch.isspace())
+)
+
+# Nigerian numbers: +234 followed by 10 digits
+# Valid prefixes after 234: 70, 80, 81, 90, 91, etc.
+_PHONE_RE = re.compile(r"^\+234[789][01]\d{8}$")
+
+
+def normalize_nigerian_phone(phone: str) -> str:
+    """
+    Normalize Nigerian phone number to +234 format.
+    
+    Accepts:
+    - Local format: 08012345678 → +2348012345678
+    - International: +2348012345678 → +2348012345678
+    - With spaces/dashes: 080-1234-5678 → +2348012345678
+    """
+    # Remove spaces, dashes, parentheses
+    cleaned = phone.translate(_PHONE_STRIP)
+    
+    # Dispatch on the first character; the guards only run for "+" and "2"
+    match cleaned[:1]:
+        # Starts with 0: replace with +234
+        case "0":
+            return "+234" + cleaned[1:]
+        # Already +234
+        case "+" if cleaned[1:4] == "234":
+            return cleaned
+        # Starts with 234 (no +): add +
+        case "2" if cleaned[1:3] == "34":
+            return "+" + cleaned
+        # Anything else: assume local and add prefix
+        case _:
+            return "+234" + cleaned
+
+
+def validate_nigerian_phone(phone: str) -> str:
+    """Validate and normalize Nigerian phone number."""
+    normalized = normalize_nigerian_phone(phone)
+    
+    if not _PHONE_RE.match(normalized):
+        raise ValueError(
+            "Invalid Nigerian phone number. "
+            "Expected format: 08012345678 or +2348012345678"
+        )
+    
+    return normalized
+
+
+# =============================================================================
+# Contact form spam signals
+# =============================================================================
+
+# Common spam phrases to detect (one spam signal per list)
+_PHRASE_LISTS = [
+    "viagra|cialis|casino|lottery|winner|prize|click here|act now",
+    "earn money|make money fast|work from home|mlm",
+    "crypto|bitcoin|investment opportunity|guaranteed returns",
+]
+_PHRASE_PATTERNS = [rf"\b({phrases})\b" for phrases in _PHRASE_LISTS]
+_URL_RUN_PATTERN = r"(https?://\S+){3,}"  # 3+ URLs is suspicious
+# Backreference, so it stays a standalone regex. Each start position gives up
+# after at most 11 characters, so the scan is linear in the text length.
+_REPEAT_PATTERN = r"(.)\1{10,}"  # 10+ repeated characters
+
+SPAM_PATTERNS = [*_PHRASE_PATTERNS, _URL_RUN_PATTERN, _REPEAT_PATTERN]
+
+# Compile patterns for performance
+SPAM_REGEX = [re.compile(p, re.IGNORECASE) for p in SPAM_PATTERNS]
+
+# The phrase lists as one alternation inside a shared \b...\b, each list in a
+# named group g<index>, so one scan reports every list that hits. The URL and
+# repeat patterns are kept separate: inside an alternation re loses the
+# literal-prefix search it uses for "http", and a catch-all "(.)" branch would
+# make every position a match attempt.
+_PHRASES_COMBINED = re.compile(
+    r"\b(?:" + "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(_PHRASE_LISTS)) + r")\b",
+    re.IGNORECASE,
+)
+_URL_RUN_RE = SPAM_REGEX[len(_PHRASE_PATTERNS)]
+_REPEAT_RE = SPAM_REGEX[len(_PHRASE_PATTERNS) + 1]
+
+
+def detect_spam_signals(text: str) -> list[str]:
+    """
+    Detect spam signals in text. Returns list of triggered patterns.
+    """
+    signals = []
+
+    hits = {m.lastgroup for m in _PHRASES_COMBINED.finditer(text)}
+    if hits:
+        # finditer only reports non-overlapping matches, so a list can be hidden
+        # inside another list's match; confirm the remaining ones individually.
+        signals = [
+            pattern.pattern
+            for i, pattern in enumerate(SPAM_REGEX[: len(_PHRASE_PATTERNS)])
+            if f"g{i}" in hits or pattern.search(text)
+        ]
+
+    # Three URLs need three "://"; counting is much cheaper than the regex
+    if text.count("://") >= 3 and _URL_RUN_RE.search(text):
+        signals.append(_URL_RUN_PATTERN)
+
+    if _REPEAT_RE.search(text):
+        signals.append(_REPEAT_PATTERN)
+
+    return signals
+
+
+_URL_RE = re.compile(r"https?://\S+", re.IGNORECASE)
+
+
+def contains_excessive_links(text: str) -> bool:
+    """Check if text contains excessive URLs (common spam indicator)."""
+    # Every URL match contains "://", so with two or fewer the regex can't find three
+    if text.count("://") <= 2:
+        return False
+    # Stop at the third URL instead of collecting them all
+    return next(islice(_URL_RE.finditer(text), 2, None), None) is not None
+
+
+_VOWELS = "aeiouAEIOU"
+_CONSONANTS = "bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ"
+# Everything [a-zA-Z0-9\s.,!?'-] accepts; \s covers Unicode whitespace, all of
+# which lies below U+3001
+_NOT_SPECIAL = (
+    string.ascii_letters
+    + string.digits
+    + ".,!?'-"
+    + "".join(ch for ch in map(chr, range(0x3001)) if ch.isspace())
+)
+
+# Deletion tables: a class's count is how much translate() shortens the text
+_DROP_VOWELS = str.maketrans("", "", _VOWELS)
+_DROP_CONSONANTS = str.maketrans("", "", _CONSONANTS)
+_DROP_NOT_SPECIAL = str.maketrans("", "", _NOT_SPECIAL)
+
+
+def is_gibberish(text: str) -> bool:
+    """
+    Basic gibberish detection:
+    - Very low ratio of vowels to consonants
+    - Excessive special characters
+    """
+    if len(text) < 10:
+        return False
+    
+    # Count vowels vs consonants
+    length = len(text)
+    vowels = length - len(text.translate(_DROP_VOWELS))
+    consonants = length - len(text.translate(_DROP_CONSONANTS))
+    
+    if consonants > 0 and vowels / consonants < 0.1:
+        return True
+    
+    # Excessive special characters
+    special = len(text.translate(_DROP_NOT_SPECIAL))
+    if special > length * 0.3:
+        return True
+    
+    return False
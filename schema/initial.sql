@@ -0,0 +1,41 @@
+-- Consolidated schema for fresh databases, applied by `python -m app.init_db`.
+-- revision: 20261015_000007
+--
+-- Equivalent to running every Alembic migration up to the revision above on an
+-- empty database. init_db stamps that revision and then runs `alembic upgrade
+-- head`, so migrations added later still apply; regenerate this file (and bump
+-- the revision) when convenient to keep fresh deploys to a single step.
+
+CREATE TABLE waitlist (
+    id BIGSERIAL PRIMARY KEY,
+    email VARCHAR(320) NOT NULL,
+    source VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    first_name VARCHAR(50) NOT NULL,
+    last_name VARCHAR(50) NOT NULL,
+    phone VARCHAR(20) NOT NULL,
+    CONSTRAINT ck_waitlist_email_lowercase CHECK (email = lower(email))
+);
+
+CREATE UNIQUE INDEX uq_waitlist_email ON waitlist (email);
+CREATE UNIQUE INDEX uq_waitlist_phone ON waitlist (phone);
+
+CREATE TABLE contact_messages (
+    id BIGSERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(320) NOT NULL,
+    subject VARCHAR(200) NOT NULL,
+    message TEXT NOT NULL,
+    ip_address INET,
+    user_agent TEXT,
+    is_spam BOOLEAN NOT NULL DEFAULT false,
+    is_read BOOLEAN NOT NULL DEFAULT false,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT clock_timestamp(),
+    CONSTRAINT ck_contact_messages_email_lowercase CHECK (email = lower(email))
+);
+
+CREATE INDEX ix_contact_messages_created_at ON contact_messages (created_at);
+CREATE INDEX ix_contact_messages_ip_created ON contact_messages (ip_address, created_at);
+CREATE INDEX ix_contact_messages_email_created ON contact_messages (email, created_at);
+CREATE INDEX ix_contact_messages_updated_at ON contact_messages (updated_at);